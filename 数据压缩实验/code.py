@@ -1,258 +1,383 @@
-import heapq
-import os
-import time
-from collections import defaultdict
-from decimal import Decimal, getcontext  # 用于高精度算术计算
-
-# 霍夫曼树节点类
-class HuffmanNode:
-    def __init__(self, freq, byte=None, left=None, right=None):
-        self.freq = freq    # 节点频率
-        self.byte = byte    # 字节值（仅叶子节点有值）
-        self.left = left    # 左子树
-        self.right = right  # 右子树
-
-    # 用于堆排序的比较方法
-    def __lt__(self, other):
-        return self.freq < other.freq
-
-def huffman_compress(text_bytes):
-    # 统计字节频率
-    freq = defaultdict(int)
-    for byte in text_bytes:
-        freq[byte] += 1  # 统计每个字节出现的次数
-
-    # 构建优先队列（最小堆）
-    heap = []
-    for byte, count in freq.items():
-        # 将每个字节转换为叶子节点加入堆
-        heapq.heappush(heap, HuffmanNode(count, byte=byte))
-
-    # 构建霍夫曼树
-    while len(heap) > 1:
-        # 取出频率最小的两个节点
-        left = heapq.heappop(heap)
-        right = heapq.heappop(heap)
-        # 合并为新的内部节点（频率为两者之和）
-        merged = HuffmanNode(left.freq + right.freq, left=left, right=right)
-        heapq.heappush(heap, merged)
-
-    root = heapq.heappop(heap) if heap else None  # 根节点
-    code_table = {}  # 编码表（字节->二进制字符串）
-
-    # 递归构建编码表
-    def build_code(node, current_code=""):
-        if node is None:
-            return
-        if node.byte is not None:
-            # 叶子节点：记录字节对应的编码
-            code_table[node.byte] = current_code
-            return
-        # 左子树编码加0，右子树编码加1
-        build_code(node.left, current_code + '0')
-        build_code(node.right, current_code + '1')
-
-    if root:
-        build_code(root)
-
-    # 生成编码位流
-    encoded_bits = ''.join([code_table[byte] for byte in text_bytes])
-    # 计算填充位数（使总位数为8的倍数）
-    padding = 8 - (len(encoded_bits) % 8)
-    if padding != 8:
-        encoded_bits += '0' * padding  # 填充0
-
-    # 转换为字节列表
-    bytes_list = [int(encoded_bits[i:i+8], 2) for i in range(0, len(encoded_bits), 8)]
-
-    # 保存压缩后的二进制文件
-    with open('huffman_compressed.bin', 'wb') as f:
-        f.write(bytes(bytes_list))
-
-    # 保存中间信息（频率表和编码表）
-    with open('huffman_info.txt', 'w', encoding='utf-8') as f:
-        f.write("=== 字符频率表 ===\n")
-        # 按频率从高到低排序
-        for byte, count in sorted(freq.items(), key=lambda x: -x[1]):
-            # 处理不可打印字符（用空格表示）
-            char = chr(byte) if 32 <= byte <= 126 else ' '
-            f.write(f"字节 {byte:3d}（字符: {char}）: 频率 = {count}\n")
-        
-        f.write("\n=== 霍夫曼编码表 ===\n")
-        # 按编码长度排序
-        for byte, code in sorted(code_table.items(), key=lambda x: len(x[1])):
-            char = chr(byte) if 32 <= byte <= 126 else ' '
-            f.write(f"字节 {byte:3d}（字符: {char}）: 编码 = {code}\n")
-
-    return {
-        'original_size': len(text_bytes),       # 原始大小
-        'compressed_size': len(bytes_list),     # 压缩后大小
-        'compression_ratio': len(bytes_list) / len(text_bytes) if text_bytes else 0,
-        'time': 0                               # 预留时间字段
-    }
-
-def arithmetic_compress(text_bytes):
-    getcontext().prec = 1000  # 设置高精度十进制精度
-
-    # 统计字节频率
-    freq = defaultdict(int)
-    for byte in text_bytes:
-        freq[byte] += 1
-
-    total = sum(freq.values())  # 总字符数
-    cum_prob = {}              # 累积概率表（字节->(下限, 上限)）
-    current = Decimal(0)       # 当前累积概率
-
-    # 生成累积概率区间
-    for byte in sorted(freq.keys()):  # 按字节值排序
-        prob = Decimal(freq[byte]) / Decimal(total)  # 计算概率
-        cum_prob[byte] = (current, current + prob)   # 记录区间
-        current += prob                              # 累加概率
-
-    low = Decimal(0)       # 区间下限
-    high = Decimal(1)      # 区间上限
-
-    # 逐个字节更新区间
-    for byte in text_bytes:
-        char_low, char_high = cum_prob[byte]  # 获取当前字节的概率区间
-        range_size = high - low               # 当前区间长度
-        # 缩小区间范围
-        high = low + range_size * char_high
-        low = low + range_size * char_low
-
-    # 将最终区间转换为二进制字符串
-    binary_str = []
-    value = low  # 取区间内任意值（通常取下限）
-    for _ in range(1024):  # 最多生成1024位二进制
-        value *= 2          # 左移一位（相当于乘以2）
-        bit = int(value)    # 提取整数部分作为二进制位
-        binary_str.append(str(bit))
-        value -= bit        # 保留小数部分
-        if value == 0:      # 提前结束条件
-            break
-
-    binary_str = ''.join(binary_str)
-    # 填充到8的倍数
-    padding = 8 - (len(binary_str) % 8)
-    if padding != 8:
-        binary_str += '0' * padding
-
-    # 转换为字节列表
-    bytes_list = [int(binary_str[i:i+8], 2) for i in range(0, len(binary_str), 8)]
-    # 保存压缩后的二进制文件
-    with open('arithmetic_compressed.bin', 'wb') as f:
-        f.write(bytes(bytes_list))
-
-    # 保存中间信息（概率区间和最终区间）
-    with open('arithmetic_info.txt', 'w', encoding='utf-8') as f:
-        f.write("=== 字符概率区间表 ===\n")
-        for byte in sorted(cum_prob.keys()):
-            low_range, high_range = cum_prob[byte]
-            # 转换为浮点数便于显示（牺牲精度）
-            char = chr(byte) if 32 <= byte <= 126 else ' '
-            f.write(f"字节 {byte:3d}（字符: {char}）: 区间 = [{float(low_range):.10f}, {float(high_range):.10f})\n")
-        
-        f.write(f"\n最终压缩区间: [{float(low):.20f}, {float(high):.20f})\n")
-
-    return {
-        'original_size': len(text_bytes),
-        'compressed_size': len(bytes_list),
-        'compression_ratio': len(bytes_list) / len(text_bytes) if text_bytes else 0,
-        'time': 0
-    }
-
-def lzw_compress(text_bytes):
-    # 初始化字典：单字节到索引的映射（0-255）
-    dictionary = {bytes([i]): i for i in range(256)}
-    next_code = 256  # 下一个可用索引
-    s = bytes()       # 当前匹配字符串
-    encoded = []      # 编码结果列表
-
-    for byte in text_bytes:
-        sc = s + bytes([byte])  # 尝试扩展当前字符串
-        if sc in dictionary:
-            s = sc  # 存在则继续扩展
-        else:
-            # 输出当前字符串的索引
-            encoded.append(dictionary[s])
-            # 将新字符串加入字典
-            dictionary[sc] = next_code
-            next_code += 1
-            s = bytes([byte])  # 重置当前字符串为当前字节
-    # 处理最后一个字符串
-    if s:
-        encoded.append(dictionary[s])
-
-    # 将编码转换为12位二进制字符串（假设索引最大4095）
-    bits_str = ''.join([format(code, '012b') for code in encoded])
-    # 填充到8的倍数
-    padding = 8 - (len(bits_str) % 8)
-    if padding != 8:
-        bits_str += '0' * padding
-
-    # 转换为字节列表
-    bytes_list = [int(bits_str[i:i+8], 2) for i in range(0, len(bits_str), 8)]
-    # 保存压缩后的二进制文件
-    with open('lzw_compressed.bin', 'wb') as f:
-        f.write(bytes(bytes_list))
-
-    # 保存中间信息（字典大小和编码序列）
-    with open('lzw_info.txt', 'w', encoding='utf-8') as f:
-        f.write(f"字典最大索引: {next_code - 1}\n")
-        f.write("\n=== 编码序列 ===\n")
-        for i, code in enumerate(encoded):
-            if i % 20 == 0 and i != 0:
-                f.write("\n")  # 每20个编码换行
-            f.write(f"{code:4d} ")  # 固定宽度输出
-
-    return {
-        'original_size': len(text_bytes),
-        'compressed_size': len(bytes_list),
-        'compression_ratio': len(bytes_list) / len(text_bytes) if text_bytes else 0,
-        'time': 0
-    }
-
-def main():
-    # 读取原始文件（自动处理UTF-8编码）
-    with open('pki_text.txt', 'r', encoding='utf-8') as f:
-        text = f.read()
-    text_bytes = text.encode('utf-8')  # 转换为字节流
-
-    # 霍夫曼编码
-    start = time.time()
-    huffman_result = huffman_compress(text_bytes)
-    huffman_time = (time.time() - start)*1000
-
-    # 算术编码
-    start = time.time()
-    arithmetic_result = arithmetic_compress(text_bytes)
-    arithmetic_time = (time.time() - start)*1000
-
-    # LZW编码
-    start = time.time()
-    lzw_result = lzw_compress(text_bytes)
-    lzw_time = (time.time() - start)*1000
-
-    # 输出霍夫曼编码结果
-    print("霍夫曼编码:")
-    print(f"原始文件大小: {huffman_result['original_size']} 字节")
-    print(f"压缩后大小: {huffman_result['compressed_size']} 字节")
-    print(f"压缩比: {huffman_result['compression_ratio']:.2%}")
-    print(f"耗时: {huffman_time:.2f}ms\n")
-
-    # 输出算术编码结果
-    print("算术编码:")
-    print(f"原始文件大小: {arithmetic_result['original_size']} 字节")
-    print(f"压缩后大小: {arithmetic_result['compressed_size']} 字节")
-    print(f"压缩比: {arithmetic_result['compression_ratio']:.2%}")
-    print(f"耗时: {arithmetic_time:.2f}ms\n")
-
-    # 输出LZW编码结果
-    print("LZW编码:")
-    print(f"原始文件大小: {lzw_result['original_size']} 字节")
-    print(f"压缩后大小: {lzw_result['compressed_size']} 字节")
-    print(f"压缩比: {lzw_result['compression_ratio']:.2%}")
-    print(f"耗时: {lzw_time:.2f}ms\n")
-
-if __name__ == "__main__":
+import concurrent.futures
+import os
+import time
+
+import numpy as np  # 用于向量化的频率统计等加速
+
+# 小于该阈值的输入，进程启动开销大于并行收益，直接串行压缩
+PARALLEL_THRESHOLD = 32 * 1024
+
+# 输入熵（比特/字节）超过该阈值时霍夫曼几乎无收益，改用存储模式
+STORE_THRESHOLD = 7.5
+
+
+def count_byte_freq(text_bytes):
+    # 用numpy在C层一次性统计256个字节值的出现次数
+    # 比逐字节的Python循环快约两个数量级
+    arr = np.frombuffer(text_bytes, dtype=np.uint8)
+    counts = np.bincount(arr, minlength=256)
+    # 只保留出现过的字节，保持原有dict接口
+    return {byte: int(count) for byte, count in enumerate(counts) if count}
+
+def build_huffman_table(freq_or_bytes):
+    # 构建规范霍夫曼编码表，返回按字节值索引的 (code_len, code_bits)。
+    # 参数可以是频率表dict，也可以直接传原始字节流。
+    # 对分布相近的多段数据重复压缩时，调用方可用本函数建一次表，
+    # 再通过huffman_compress的precomputed_table参数复用，省掉每次建树
+    if isinstance(freq_or_bytes, dict):
+        freq = freq_or_bytes
+    else:
+        # 统计字节频率（numpy直方图，一次C循环）
+        freq = count_byte_freq(freq_or_bytes)
+
+    # 兄弟算法（两队列法）构建霍夫曼树：叶子按频率排序一次后排队，
+    # 新合并的内部节点按生成顺序天然有序地进入第二个队列，每步只需
+    # 比较两个队头即可取出当前最小的两个节点。整棵树存放在并行数组
+    # 里（节点0..nsym-1为叶子，其后为内部节点），不再需要堆和节点对象
+    syms = sorted(freq, key=lambda b: freq[b])  # 叶子按频率升序
+    nsym = len(syms)
+    nnodes = max(2 * nsym - 1, 0)  # 树的总节点数
+    left = [0] * nnodes
+    right = [0] * nnodes
+    node_freq = [freq[b] for b in syms] + [0] * max(nsym - 1, 0)
+
+    leaf = 0           # 叶子队列头
+    internal = nsym    # 内部节点队列头
+    next_node = nsym   # 下一个新建内部节点编号
+    while next_node < nnodes:
+        # 连取两次当前频率最小的节点（比较两个队头）
+        for child in (left, right):
+            if leaf < nsym and (internal >= next_node
+                                or node_freq[leaf] <= node_freq[internal]):
+                child[next_node] = leaf
+                leaf += 1
+            else:
+                child[next_node] = internal
+                internal += 1
+        # 合并为新的内部节点（频率为两者之和）
+        node_freq[next_node] = (node_freq[left[next_node]]
+                                + node_freq[right[next_node]])
+        next_node += 1
+
+    # 迭代遍历数组形式的树（显式栈），只需得到每个字节的编码长度
+    code_len = np.zeros(256, dtype=np.uint8)
+    if nnodes:
+        stack = [(nnodes - 1, 0)]  # (节点编号, 深度)，从根开始
+        while stack:
+            node, depth = stack.pop()
+            if node < nsym:
+                code_len[syms[node]] = depth  # 叶子深度即编码长度
+                continue
+            stack.append((right[node], depth + 1))
+            stack.append((left[node], depth + 1))
+
+    # 规范霍夫曼编码：编码值完全由长度决定（RFC 1951风格）——
+    # 按(长度, 字节值)排序后依次分配递增的编码值，长度增加时左移补位，
+    # 这样同长度的编码连续，解码端只需长度表即可重建整个编码表
+    code_bits = np.zeros(256, dtype=np.uint32)
+    next_code = 0
+    prev_len = 0
+    for byte in sorted(freq, key=lambda b: (int(code_len[b]), b)):
+        length = int(code_len[byte])
+        next_code <<= length - prev_len
+        code_bits[byte] = next_code
+        next_code += 1
+        prev_len = length
+
+    return code_len, code_bits
+
+def encode_with_table(text_bytes, code_len, code_bits):
+    # 用给定的 (code_len, code_bits) 编码表把输入编码为字节串
+    # 先在C层一次性取出每个输入字节的编码长度/编码值（numpy花式索引），
+    # 长度总和直接给出输出位数，输出缓冲据此一次性预分配到位
+    arr = np.frombuffer(text_bytes, dtype=np.uint8)
+    per_len = code_len[arr]
+    per_bits = code_bits[arr]
+    total_bits = int(per_len.sum())
+
+    # 用整数位缓冲逐字节产生输出：把编码移入缓冲，攒够8位就落一个字节
+    out = bytearray((total_bits + 7) // 8)
+    buf = 0      # 位缓冲（低nbits位有效）
+    nbits = 0    # 缓冲中待输出的位数
+    pos = 0      # 输出写入位置
+    for length, code in zip(per_len.tolist(), per_bits.tolist()):
+        buf = (buf << length) | code
+        nbits += length
+        while nbits >= 8:
+            nbits -= 8
+            out[pos] = (buf >> nbits) & 0xFF
+            pos += 1
+        buf &= (1 << nbits) - 1  # 丢弃已输出的高位，保持缓冲为小整数
+    if nbits:
+        out[pos] = (buf << (8 - nbits)) & 0xFF  # 末尾补0到字节边界
+
+    return out
+
+def huffman_compress(text_bytes, write_info=False, precomputed_table=None):
+    # 先由频率估计输入熵：接近8比特/字节的高熵数据（如已压缩文件）
+    # 霍夫曼编码几乎无收益，直接以存储模式写出（1字节标志+原文），
+    # 省去建树和逐字节编码
+    if text_bytes and precomputed_table is None:
+        counts = np.bincount(np.frombuffer(text_bytes, dtype=np.uint8),
+                             minlength=256)
+        p = counts[counts > 0] / len(text_bytes)
+        entropy = float(-(p * np.log2(p)).sum())
+        if entropy > STORE_THRESHOLD:
+            with open('huffman_compressed.bin', 'wb', buffering=1 << 20) as f:
+                f.write(b'\x00')  # 存储模式标志
+                f.write(text_bytes)
+            if write_info:
+                with open('huffman_info.txt', 'w', encoding='utf-8') as f:
+                    f.write(f"输入熵约 {entropy:.3f} 比特/字节，"
+                            "接近不可压缩，已按存储模式原样写出\n")
+            size = len(text_bytes) + 1
+            return {
+                'original_size': len(text_bytes),
+                'compressed_size': size,
+                'compression_ratio': size / len(text_bytes),
+                'time': 0
+            }
+
+    # 建表与编码两阶段分离：已有现成编码表（如对同分布数据批量压缩）
+    # 的调用方可通过precomputed_table跳过建树
+    if precomputed_table is not None:
+        code_len, code_bits = precomputed_table
+    else:
+        code_len, code_bits = build_huffman_table(text_bytes)
+
+    out = encode_with_table(text_bytes, code_len, code_bits)
+
+    # 保存压缩后的二进制文件（memoryview零拷贝写出，加大写缓冲）
+    with open('huffman_compressed.bin', 'wb', buffering=1 << 20) as f:
+        f.write(memoryview(out))
+
+    # 保存中间信息（频率表和编码表），默认关闭以免拖慢压缩主路径
+    if write_info:
+        freq = count_byte_freq(text_bytes)
+        # 编码表（字节->二进制字符串），仅供信息文件展示，由数值表生成
+        code_table = {byte: format(int(code_bits[byte]), '0%db' % code_len[byte])
+                      if code_len[byte] else ''
+                      for byte in freq}
+        # 先拼好所有行，最后一次性写入
+        lines = ["=== 字符频率表 ==="]
+        # 按频率从高到低排序
+        for byte, count in sorted(freq.items(), key=lambda x: -x[1]):
+            # 处理不可打印字符（用空格表示）
+            char = chr(byte) if 32 <= byte <= 126 else ' '
+            lines.append(f"字节 {byte:3d}（字符: {char}）: 频率 = {count}")
+
+        lines.append("")
+        lines.append("=== 霍夫曼编码表 ===")
+        # 按编码长度排序
+        for byte, code in sorted(code_table.items(), key=lambda x: len(x[1])):
+            char = chr(byte) if 32 <= byte <= 126 else ' '
+            lines.append(f"字节 {byte:3d}（字符: {char}）: 编码 = {code}")
+        with open('huffman_info.txt', 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+
+    return {
+        'original_size': len(text_bytes),       # 原始大小
+        'compressed_size': len(out),            # 压缩后大小
+        'compression_ratio': len(out) / len(text_bytes) if text_bytes else 0,
+        'time': 0                               # 预留时间字段
+    }
+
+def arithmetic_compress(text_bytes, write_info=False):
+    # 统计字节频率（numpy直方图，一次C循环）
+    counts = np.bincount(np.frombuffer(text_bytes, dtype=np.uint8), minlength=256)
+    total = len(text_bytes)
+    # 整数累积频率表：字节b对应区间 [cum[b], cum[b+1])
+    cum = [0] * 257
+    running = 0
+    for byte in range(256):
+        running += int(counts[byte])
+        cum[byte + 1] = running
+
+    # 经典32位整数算术编码：区间随输入逐字节缩小，
+    # 通过E1/E2/E3重归一化在编码过程中逐位输出，精度恒定为32位，
+    # 不再随输入长度增长（取代原先的高精度Decimal运算）
+    FULL = 0xFFFFFFFF       # 区间上界（2^32 - 1）
+    HALF = 0x80000000       # 区间中点
+    QUARTER = 0x40000000    # 1/4点
+    low = 0                 # 区间下限
+    high = FULL             # 区间上限
+    pending = 0             # E3缩放后待定的反位数量
+    bit_list = []           # 输出位序列
+
+    # 逐个字节缩小区间并重归一化
+    for byte in text_bytes:
+        rng = high - low + 1
+        high = low + rng * cum[byte + 1] // total - 1
+        low = low + rng * cum[byte] // total
+        while True:
+            if high < HALF:
+                # E1：区间落在下半，最高位确定为0
+                bit_list.append(0)
+                bit_list.extend([1] * pending)
+                pending = 0
+            elif low >= HALF:
+                # E2：区间落在上半，最高位确定为1
+                bit_list.append(1)
+                bit_list.extend([0] * pending)
+                pending = 0
+                low -= HALF
+                high -= HALF
+            elif low >= QUARTER and high < HALF + QUARTER:
+                # E3：区间跨越中点但不足一半，先缩放、位数待定
+                pending += 1
+                low -= QUARTER
+                high -= QUARTER
+            else:
+                break
+            # 区间放大一倍（下限补0，上限补1）
+            low <<= 1
+            high = (high << 1) | 1
+
+    # 收尾：输出足够的位唯一确定最终区间内的一个值
+    pending += 1
+    if low < QUARTER:
+        bit_list.append(0)
+        bit_list.extend([1] * pending)
+    else:
+        bit_list.append(1)
+        bit_list.extend([0] * pending)
+
+    # 用numpy一次性打包成字节（packbits自动在末尾补0到字节边界）
+    packed = np.packbits(np.array(bit_list, dtype=np.uint8))
+    # 保存压缩后的二进制文件（直接写numpy缓冲区，不经tobytes拷贝）
+    with open('arithmetic_compressed.bin', 'wb', buffering=1 << 20) as f:
+        f.write(memoryview(packed))
+
+    # 保存中间信息（概率区间和最终区间），默认关闭以免拖慢压缩主路径
+    if write_info:
+        lines = ["=== 字符概率区间表 ==="]
+        for byte in range(256):
+            if cum[byte + 1] == cum[byte]:
+                continue  # 跳过未出现的字节
+            # 转换为浮点数便于显示（牺牲精度）
+            char = chr(byte) if 32 <= byte <= 126 else ' '
+            lines.append(f"字节 {byte:3d}（字符: {char}）: 区间 = [{cum[byte] / total:.10f}, {cum[byte + 1] / total:.10f})")
+
+        lines.append(f"\n最终压缩区间（重归一化后）: [{low / (FULL + 1):.20f}, {(high + 1) / (FULL + 1):.20f})")
+        with open('arithmetic_info.txt', 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+
+    return {
+        'original_size': len(text_bytes),
+        'compressed_size': packed.size,
+        'compression_ratio': packed.size / len(text_bytes) if text_bytes else 0,
+        'time': 0
+    }
+
+def lzw_compress(text_bytes, write_info=False):
+    # 字典组织为整数字典树：键为 (当前串编号<<8)|下一个字节，值为新串编号
+    # 单字节串的编号就是字节值本身（0-255），无需显式建初始表，
+    # 也不再为每个输入字节拼接/哈希bytes对象
+    children = {}
+    next_code = 256   # 下一个可用索引
+    encoded = []      # 编码结果列表
+    added = []        # 自上次重置以来新增的键，重置时只需删除这些
+
+    # 当前匹配串的编号（首字节直接作为起始串）
+    cur = text_bytes[0] if text_bytes else -1
+    for byte in memoryview(text_bytes)[1:]:
+        key = (cur << 8) | byte  # 尝试扩展当前串
+        node = children.get(key)
+        if node is not None:
+            cur = node  # 存在则继续扩展
+        else:
+            # 输出当前串的索引
+            encoded.append(cur)
+            if next_code < 4096:
+                # 将新串加入字典
+                children[key] = next_code
+                added.append(key)
+                next_code += 1
+            else:
+                # 字典满：12位编码已到上限，重置回初始状态，否则后续
+                # 编码会超出12位、输出损坏。只删除本轮新增的键（O(新增数)），
+                # 无需重建字典；跨越重置点的新串不入典（其前缀编号已失效），
+                # 解码端在相同位置按同样规则重置即可保持同步
+                for k in added:
+                    del children[k]
+                added.clear()
+                next_code = 256
+            cur = byte  # 重置当前串为当前字节
+    # 处理最后一个串
+    if cur >= 0:
+        encoded.append(cur)
+
+    # 将编码打包为12位定长位流（假设索引最大4095）
+    # 先按大端16位展开成位矩阵，丢弃每个编码的高4位，再packbits打包
+    codes = np.array(encoded, dtype='>u2')
+    bit_arr = np.unpackbits(codes.view(np.uint8)).reshape(-1, 16)[:, 4:].reshape(-1)
+    packed = np.packbits(bit_arr)  # 自动在末尾补0到字节边界
+    # 保存压缩后的二进制文件（直接写numpy缓冲区，不经tobytes拷贝）
+    with open('lzw_compressed.bin', 'wb', buffering=1 << 20) as f:
+        f.write(memoryview(packed))
+
+    # 保存中间信息（字典大小和编码序列），默认关闭以免拖慢压缩主路径
+    if write_info:
+        lines = [f"字典最大索引: {next_code - 1}", "", "=== 编码序列 ==="]
+        # 每20个编码一行，固定宽度输出
+        for i in range(0, len(encoded), 20):
+            lines.append(''.join(f"{c:4d} " for c in encoded[i:i + 20]))
+        with open('lzw_info.txt', 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+
+    return {
+        'original_size': len(text_bytes),
+        'compressed_size': packed.size,
+        'compression_ratio': packed.size / len(text_bytes) if text_bytes else 0,
+        'time': 0
+    }
+
+def run_codec(compress, text_bytes):
+    # 执行单个压缩器并在结果中填入耗时（毫秒）
+    start = time.time()
+    result = compress(text_bytes, write_info=True)
+    result['time'] = (time.time() - start) * 1000
+    return result
+
+def main():
+    # 读取原始文件（自动处理UTF-8编码）
+    with open('pki_text.txt', 'r', encoding='utf-8') as f:
+        text = f.read()
+    text_bytes = text.encode('utf-8')  # 转换为字节流
+
+    codecs = [huffman_compress, arithmetic_compress, lzw_compress]
+    if len(text_bytes) >= PARALLEL_THRESHOLD:
+        # 三种编码互相独立且都是CPU密集型，各自写不同的输出文件，
+        # 用多进程并行执行（纯Python代码受GIL限制，线程无法并行）
+        with concurrent.futures.ProcessPoolExecutor(max_workers=3) as executor:
+            futures = [executor.submit(run_codec, compress, text_bytes)
+                       for compress in codecs]
+            results = [future.result() for future in futures]
+    else:
+        # 小输入串行执行，避免进程启动开销
+        results = [run_codec(compress, text_bytes) for compress in codecs]
+    huffman_result, arithmetic_result, lzw_result = results
+
+    # 输出霍夫曼编码结果
+    print("霍夫曼编码:")
+    print(f"原始文件大小: {huffman_result['original_size']} 字节")
+    print(f"压缩后大小: {huffman_result['compressed_size']} 字节")
+    print(f"压缩比: {huffman_result['compression_ratio']:.2%}")
+    print(f"耗时: {huffman_result['time']:.2f}ms\n")
+
+    # 输出算术编码结果
+    print("算术编码:")
+    print(f"原始文件大小: {arithmetic_result['original_size']} 字节")
+    print(f"压缩后大小: {arithmetic_result['compressed_size']} 字节")
+    print(f"压缩比: {arithmetic_result['compression_ratio']:.2%}")
+    print(f"耗时: {arithmetic_result['time']:.2f}ms\n")
+
+    # 输出LZW编码结果
+    print("LZW编码:")
+    print(f"原始文件大小: {lzw_result['original_size']} 字节")
+    print(f"压缩后大小: {lzw_result['compressed_size']} 字节")
+    print(f"压缩比: {lzw_result['compression_ratio']:.2%}")
+    print(f"耗时: {lzw_result['time']:.2f}ms\n")
+
+if __name__ == "__main__":
     main()
\ No newline at end of file